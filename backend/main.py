@@ -1,15 +1,26 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
-import openai
-from openai import OpenAI
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional, Dict, Any, Tuple, Iterator, Iterable
+from openai import AsyncOpenAI
 import git
+import ahocorasick
 import os
 import re
+import asyncio
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 import sqlite3
 import json
+import orjson
+import uuid
+import time
+import hashlib
+from itertools import islice
+from functools import lru_cache
 from datetime import datetime, date
 import logging
 from pathlib import Path
@@ -27,7 +38,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json"
+    openapi_url="/api/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -43,13 +55,27 @@ app.add_middleware(
 openai_api_key = os.getenv("OPENAI_API_KEY")
 if not openai_api_key:
     logger.warning("OPENAI_API_KEY not set. AI features will be disabled.")
-    client = None
+
+# Shared client, so requests reuse one HTTP connection pool
+aclient = AsyncOpenAI() if openai_api_key else None
 
 # Database setup
 DB_PATH = "changelog.db"
 
+# One connection shared by every request. Writes (and the commit that ends
+# them) are serialized with db_write_lock. Reads take no lock and run on the
+# same connection, so they may see a write that is still mid-transaction;
+# WAL makes commits cheaper but adds no reader concurrency here.
+db_conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+db_conn.row_factory = sqlite3.Row
+db_write_lock = threading.Lock()
+
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
+    conn = db_conn
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
     conn.execute('''
         CREATE TABLE IF NOT EXISTS changelogs (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -62,13 +88,44 @@ def init_db():
             is_published BOOLEAN DEFAULT FALSE
         )
     ''')
+    # Lookups by version use the implicit UNIQUE index; listings need this one
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_published_created
+        ON changelogs(is_published, created_at DESC)
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS batch_jobs (
+            id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            title TEXT NOT NULL,
+            content TEXT,
+            raw_commits TEXT NOT NULL,
+            summary TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            completed_at TIMESTAMP
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS ai_cache (
+            key TEXT PRIMARY KEY,
+            content TEXT NOT NULL,
+            created_at TIMESTAMP
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS commit_files (
+            sha TEXT PRIMARY KEY,
+            files_json TEXT NOT NULL
+        )
+    ''')
     conn.commit()
-    conn.close()
 
 init_db()
 
 # Pydantic models
 class CommitInfo(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     hash: str
     message: str
     author: str
@@ -88,6 +145,14 @@ class GenerateChangelogRequest(BaseModel):
         r"^ci:",
         r"^build:"
     ])
+    commit_shas: Optional[List[str]] = Field(
+        default=None,
+        description="Pre-filtered commit hashes to use instead of walking the range"
+    )
+
+class GenerateAndPublishRequest(GenerateChangelogRequest):
+    version: str
+    title: Optional[str] = Field(default=None, description="Custom title, defaults to the generated one")
 
 class PublishChangelogRequest(BaseModel):
     version: str
@@ -96,6 +161,8 @@ class PublishChangelogRequest(BaseModel):
     raw_commits: str
 
 class ChangelogResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     id: int
     version: str
     title: str
@@ -105,12 +172,56 @@ class ChangelogResponse(BaseModel):
     is_published: bool
 
 class GeneratedChangelog(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     title: str
     content: str
     raw_commits: List[CommitInfo]
     summary: Dict[str, Any]
 
+class BatchJobResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
+    id: str
+    status: str
+    title: str
+    content: Optional[str]
+    raw_commits: List[CommitInfo]
+    summary: Dict[str, Any]
+    created_at: str
+    completed_at: Optional[str]
+
 # AI Configuration
+OPENAI_MODEL = "gpt-4o"
+SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are an expert technical writer specializing in user-facing changelogs for developer tools."
+}
+
+# Keywords for the non-AI fallback, by category in priority order. Matched
+# in one pass over each message with an Aho-Corasick automaton.
+SIMPLE_CATEGORIES = {
+    "features": ['feat', 'feature', 'add', 'new'],
+    "fixes": ['fix', 'bug', 'resolve', 'patch'],
+    "improvements": ['improve', 'enhance', 'update', 'optimize']
+}
+CATEGORY_PRIORITY = {category: index for index, category in enumerate(SIMPLE_CATEGORIES)}
+
+KEYWORD_AUTOMATON = ahocorasick.Automaton()
+for category, words in SIMPLE_CATEGORIES.items():
+    for word in words:
+        KEYWORD_AUTOMATON.add_word(word, category)
+KEYWORD_AUTOMATON.make_automaton()
+
+# Commits are summarized in groups, with a cap on in-flight OpenAI requests
+COMMITS_PER_REQUEST = 50
+MAX_CONCURRENT_REQUESTS = 8
+openai_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+# Commit sets larger than this are summarized through the OpenAI Batch API
+BATCH_THRESHOLD = int(os.getenv("BATCH_THRESHOLD", "200"))
+BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
 CHANGELOG_PROMPT = """
 You are an expert technical writer creating user-facing changelogs for developer tools.
 
@@ -132,92 +243,369 @@ Commits to process:
 Generate a user-focused changelog in Markdown format:
 """
 
-def get_db():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+def get_db() -> sqlite3.Connection:
+    return db_conn
+
+# One NUL-separated record per commit, optionally followed by its changed files
+GIT_LOG_FORMAT = "--pretty=format:%H%x00%an%x00%cI%x00%B%x00"
+GIT_LOG_FIELDS = 4
+GIT_FILES_FORMAT = "--pretty=format:%H%x00"
+
+# Commits whose file lists are looked up together, and how uncached ones
+# are spread across parallel `git log` processes
+COMMIT_FILES_BATCH_SIZE = 500
+DIFF_WORKERS = os.cpu_count() or 1
+MIN_COMMITS_PER_DIFF = 25
+
+# Exclude patterns without these characters are plain text, checked with a
+# substring test as the log is read, before any file lookups
+LITERAL_UNSAFE_CHARS = set(".^$*+?{}[]\\|()\n")
+
+COMMIT_SHA_RE = re.compile(r"[0-9a-fA-F]{4,64}")
 
-def get_git_commits(repo_path: str, days: int = 7, from_commit: str = None, to_commit: str = None) -> List[CommitInfo]:
-    """Extract commits from Git repository"""
+# Numbered backreferences change meaning once patterns share one alternation
+BACKREFERENCE_RE = re.compile(r"\\[1-9]")
+
+# How often (in seconds) a repository's commit-graph is rewritten
+COMMIT_GRAPH_MAX_AGE = 3600
+
+# Last commit-graph attempt per git dir, so a repository where the write
+# fails (or the stamp can't be saved) is not retried on every request
+commit_graph_attempts: Dict[str, float] = {}
+
+def parse_git_log(tokens: Iterable[str], fields: int) -> Iterator[Tuple[List[str], List[str]]]:
+    """Parse the NUL-delimited output of `git log -z`, yielding each record's fields and files"""
+    tokens = iter(tokens)
+    for sha in tokens:
+        if not sha:
+            continue
+        record = [sha] + [next(tokens) for _ in range(fields - 1)]
+        
+        # With --name-only, git separates the file list from the record with
+        # a newline; every record ends with an empty token
+        files = []
+        for path in tokens:
+            if not path:
+                break
+            files.append(path[1:] if not files and path.startswith("\n") else path)
+        
+        yield record, files
+
+def diff_commit_files(repo: git.Repo, shas: List[str]) -> Dict[str, List[str]]:
+    """List the files changed by each commit (merges against their first parent)"""
+    output = repo.git.log(
+        GIT_FILES_FORMAT, "--name-only", "-z", "--diff-merges=first-parent", "--no-walk=unsorted", *shas
+    )
+    return {record[0]: files for record, files in parse_git_log(output.split("\0"), fields=1)}
+
+def lookup_commit_files(repo: git.Repo, shas: List[str]) -> Dict[str, List[str]]:
+    """Return changed files per commit, diffing only commits missing from the cache"""
+    conn = get_db()
+    
+    placeholders = ",".join("?" * len(shas))
+    rows = conn.execute(
+        f"SELECT sha, files_json FROM commit_files WHERE sha IN ({placeholders})",
+        shas
+    ).fetchall()
+    files_by_sha = {row['sha']: json.loads(row['files_json']) for row in rows}
+    
+    missing = [sha for sha in shas if sha not in files_by_sha]
+    if missing:
+        computed = {}
+        group_size = max(MIN_COMMITS_PER_DIFF, -(-len(missing) // DIFF_WORKERS))
+        groups = list(chunk_commits(missing, group_size))
+        with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+            for files in executor.map(lambda group: diff_commit_files(repo, group), groups):
+                computed.update(files)
+        
+        with db_write_lock, conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO commit_files (sha, files_json) VALUES (?, ?)",
+                [(sha, json.dumps(files)) for sha, files in computed.items()]
+            )
+        files_by_sha.update(computed)
+    
+    return files_by_sha
+
+def read_nul_tokens(stream, chunk_size: int = 1 << 16) -> Iterator[str]:
+    """Incrementally split a binary stream on NUL bytes"""
+    buffer = b""
+    while chunk := stream.read(chunk_size):
+        *tokens, buffer = (buffer + chunk).split(b"\0")
+        for token in tokens:
+            yield token.decode("utf-8", errors="replace")
+    if buffer:
+        yield buffer.decode("utf-8", errors="replace")
+
+def ensure_commit_graph(repo: git.Repo):
+    """Write the repository's commit-graph, at most once per COMMIT_GRAPH_MAX_AGE"""
+    now = time.time()
+    last_attempt = commit_graph_attempts.get(repo.git_dir)
+    if last_attempt is not None and now - last_attempt < COMMIT_GRAPH_MAX_AGE:
+        return
+    
+    stamp = Path(repo.git_dir) / "chronicler-commit-graph"
     try:
-        repo = git.Repo(repo_path)
+        if stamp.exists() and now - stamp.stat().st_mtime < COMMIT_GRAPH_MAX_AGE:
+            commit_graph_attempts[repo.git_dir] = stamp.stat().st_mtime
+            return
+        
+        commit_graph_attempts[repo.git_dir] = now
+        # Speeds up history walks and, with --changed-paths, the file listing
+        status, _, stderr = repo.git.execute(
+            ["git", "commit-graph", "write", "--reachable", "--changed-paths"],
+            with_exceptions=False,
+            with_extended_output=True
+        )
+        if status != 0:
+            logger.warning(f"Could not write commit-graph for {repo.git_dir}: {stderr}")
+            return
+        stamp.touch()
+    except OSError as e:
+        logger.warning(f"Could not update commit-graph for {repo.git_dir}: {e}")
+
+@lru_cache(maxsize=16)
+def open_repo(repo_path: str) -> git.Repo:
+    """Resolve a repository once per path; the handle is only used to run git commands"""
+    return git.Repo(repo_path, odbt=git.GitCmdObjectDB)
+
+def git_range_args(days: int = 7, from_commit: str = None, to_commit: str = None,
+                   commit_shas: Optional[List[str]] = None) -> List[str]:
+    """Revision arguments selecting the requested commits"""
+    if commit_shas is not None:
+        # Exactly these commits, newest first; the hashes themselves are fed
+        # on stdin, since long lists would overflow the command line
+        return ["--no-walk", "--stdin"]
+    
+    if from_commit and to_commit:
+        # Get commits between specific hashes
+        return [f"{from_commit}..{to_commit}"]
+    
+    # Get commits from last N days (default is 7); git stops walking
+    # history once it is past the cutoff
+    from datetime import timedelta
+    since_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    since_date = since_date - timedelta(days=days)
+    return [f"--since={since_date.isoformat()}", "HEAD"]
+
+def is_literal_pattern(pattern: str) -> bool:
+    """Whether a case-insensitive substring test matches the same messages as `re.search` would"""
+    return not LITERAL_UNSAFE_CHARS.intersection(pattern)
+
+def get_git_commits(repo_path: str, days: int = 7, from_commit: str = None, to_commit: str = None,
+                    exclude_literals: List[str] = (), commit_shas: Optional[List[str]] = None,
+                    stats: Optional[Dict[str, int]] = None) -> Iterator[CommitInfo]:
+    """Lazily extract commits from Git repository, newest first, skipping messages containing any of `exclude_literals`.
+    
+    If given, stats["total"] is incremented for every commit read, skipped or not.
+    """
+    try:
+        repo = open_repo(repo_path)
     except git.exc.InvalidGitRepositoryError:
         raise HTTPException(status_code=400, detail="Invalid Git repository path")
     
-    commits = []
+    ensure_commit_graph(repo)
     
-    if from_commit and to_commit:
-        # Get commits between specific hashes
-        commit_range = f"{from_commit}..{to_commit}"
-        git_commits = list(repo.iter_commits(commit_range))
+    range_args = git_range_args(days, from_commit, to_commit, commit_shas)
+    literals = [pattern.lower() for pattern in exclude_literals]
+    
+    def kept(records):
+        # Counted and dropped in the same walk, so excluded commits never
+        # reach the file lookups
+        for record, files in records:
+            if stats is not None:
+                stats["total"] += 1
+            message = record[3].lower()
+            if not any(literal in message for literal in literals):
+                yield record, files
+    
+    # A single `git log` walks the history; its output is parsed as it
+    # arrives rather than buffered in full
+    if commit_shas is None:
+        process = repo.git.log(GIT_LOG_FORMAT, "-z", *range_args, as_process=True)
     else:
-        # Get commits from last N days (default is 7)
-        from datetime import timedelta
-        since_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        since_date = since_date - timedelta(days=days)
-        git_commits = list(repo.iter_commits(since=since_date))
-    
-    for commit in git_commits:
-        # Get files changed in this commit
-        files = []
+        # git reads all of stdin before it starts writing the log
+        process = repo.git.log(GIT_LOG_FORMAT, "-z", *range_args, as_process=True, istream=subprocess.PIPE)
+        process.stdin.write("".join(f"{sha}\n" for sha in commit_shas).encode("ascii"))
+        process.stdin.close()
+    records = kept(parse_git_log(read_nul_tokens(process.stdout), fields=GIT_LOG_FIELDS))
+    
+    for batch in chunk_commits(records, COMMIT_FILES_BATCH_SIZE):
+        files_by_sha = lookup_commit_files(repo, [record[0] for record, _ in batch])
+        for (sha, author, date, message), _ in batch:
+            yield CommitInfo(
+                hash=sha[:8],
+                message=message.strip(),
+                author=author,
+                date=date,
+                files=files_by_sha.get(sha, [])
+            )
+    
+    # Surfaces a bad range or revision as a GitCommandError
+    process.wait()
+
+def compile_exclude_patterns(exclude_patterns: List[str]) -> Tuple[re.Pattern, ...]:
+    """Compile exclude patterns, as a single alternation where that keeps their meaning"""
+    compiled = []
+    for pattern in exclude_patterns:
         try:
-            if commit.parents:
-                files = [item.a_path for item in commit.diff(commit.parents[0])]
-        except:
-            pass
-            
-        commits.append(CommitInfo(
-            hash=commit.hexsha[:8],
-            message=commit.message.strip(),
-            author=str(commit.author),
-            date=commit.committed_datetime.isoformat(),
-            files=files
-        ))
+            compiled.append(re.compile(pattern, re.IGNORECASE))
+        except re.error as e:
+            raise HTTPException(status_code=400, detail=f"Invalid exclude pattern {pattern!r}: {e}")
     
-    return commits
+    # One alternation beats a separate search per pattern. Patterns that
+    # can't be joined (inline global flags, clashing group names, numbered
+    # backreferences) are searched one by one instead.
+    if len(compiled) > 1 and not any(BACKREFERENCE_RE.search(pattern) for pattern in exclude_patterns):
+        try:
+            return (re.compile("|".join(f"(?:{pattern})" for pattern in exclude_patterns), re.IGNORECASE),)
+        except re.error:
+            pass
+    return tuple(compiled)
 
-def filter_commits(commits: List[CommitInfo], exclude_patterns: List[str]) -> List[CommitInfo]:
+def filter_commits(commits: Iterable[CommitInfo], exclude_patterns: List[str]) -> List[CommitInfo]:
     """Filter out commits matching exclude patterns"""
-    filtered = []
+    compiled = compile_exclude_patterns(exclude_patterns)
     
+    filtered = []
     for commit in commits:
-        should_exclude = False
-        for pattern in exclude_patterns:
-            if re.search(pattern, commit.message, re.IGNORECASE):
-                should_exclude = True
-                break
-        
-        if not should_exclude:
+        if not any(pattern.search(commit.message) for pattern in compiled):
             filtered.append(commit)
     
     return filtered
 
-def generate_ai_changelog(commits: List[CommitInfo]) -> str:
+def chunk_commits(commits: Iterable, size: int):
+    """Yield successive groups of at most `size` commits"""
+    iterator = iter(commits)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+def build_changelog_messages(commits: List[CommitInfo]) -> List[Dict[str, str]]:
+    """Build the chat messages asking OpenAI to summarize the given commits"""
+    commits_text = "\n".join(
+        f"- {commit.hash}: {commit.message}{' (Files: ' + ', '.join(commit.files[:5]) + ')' if commit.files else ''}"
+        for commit in commits
+    )
+    
+    return [
+        SYSTEM_MESSAGE,
+        {"role": "user", "content": CHANGELOG_PROMPT.format(commits=commits_text)}
+    ]
+
+# Markdown structure used when merging per-group changelogs
+MARKDOWN_HEADING_RE = re.compile(r"(#{1,6})\s+(.*)")
+MARKDOWN_FENCE_RE = re.compile(r" {0,3}(```|~~~)")
+
+def merge_changelog_sections(sections: List[str]) -> str:
+    """Combine per-group changelogs, merging the categories they share.
+    
+    Only each reply's category headings are folded, matched on their words
+    so emoji or punctuation differences don't matter. Category bodies are
+    kept verbatim, blank lines and code blocks included; within a category
+    the text before any subheading comes first, then the subsections, so
+    one reply's items never land under another's subheading. Categories
+    keep the order in which they first appear, and a document title is
+    kept from the first reply only.
+    """
+    if len(sections) == 1:
+        return sections[0]
+    
+    preamble: List[str] = []
+    merged: Dict[str, Tuple[str, List[str], List[str]]] = {}
+    for index, section in enumerate(sections):
+        lines = section.splitlines()
+        
+        # Heading levels by line number, skipping fenced code blocks
+        headings = {}
+        in_fence = False
+        for number, line in enumerate(lines):
+            if MARKDOWN_FENCE_RE.match(line):
+                in_fence = not in_fence
+            elif not in_fence:
+                match = MARKDOWN_HEADING_RE.fullmatch(line)
+                if match:
+                    headings[number] = len(match.group(1))
+        
+        # Categories are H2s under an optional H1 title, else the top level
+        levels = set(headings.values())
+        category_level = 2 if 2 in levels else min(levels, default=0)
+        
+        head, categories = [], []
+        current = head
+        for number, line in enumerate(lines):
+            level = headings.get(number)
+            if level == category_level:
+                lead, rest = [], []
+                categories.append((line.strip(), lead, rest))
+                current = lead
+            elif current is head:
+                # Later replies repeat the document title
+                if not (index and level is not None and level < category_level):
+                    head.append(line)
+            else:
+                if level is not None:
+                    current = categories[-1][2]
+                current.append(line)
+        
+        text = "\n".join(head).strip("\n")
+        if text.strip():
+            preamble.append(text)
+        for heading, lead, rest in categories:
+            key = re.sub(r"[^a-z0-9 ]+", "", heading.lower()).strip()
+            entry = merged.setdefault(key, (heading, [], []))
+            for part, target in ((lead, entry[1]), (rest, entry[2])):
+                text = "\n".join(part).strip("\n")
+                if text.strip():
+                    target.append(text)
+    
+    return "\n\n".join(preamble + [
+        "\n".join([heading, *(["\n\n".join(leads + subsections)] if leads or subsections else [])])
+        for heading, leads, subsections in merged.values()
+    ])
+
+async def generate_ai_changelog(commits: List[CommitInfo]) -> str:
     """Use OpenAI to generate user-friendly changelog"""
     if not openai_api_key:
         # Fallback to simple formatting if no API key
         logger.error("No OpenAI API key found. Falling back to simple changelog generation.")
         return generate_simple_changelog(commits)
     
-    commits_text = ""
-    for commit in commits:
-        files_text = f" (Files: {', '.join(commit.files[:5])})" if commit.files else ""
-        commits_text += f"- {commit.hash}: {commit.message}{files_text}\n"
+    # The same set of commits always yields a reusable changelog
+    cache_key = hashlib.blake2b(
+        b"".join(commit.hash.encode() for commit in sorted(commits, key=lambda commit: commit.hash)),
+        digest_size=16
+    ).hexdigest()
+    conn = get_db()
+    cached = conn.execute("SELECT content FROM ai_cache WHERE key = ?", (cache_key,)).fetchone()
+    if cached:
+        logger.info("Using cached changelog.")
+        return cached['content']
+    
+    async def summarize(chunk: List[CommitInfo]) -> str:
+        async with openai_semaphore:
+            # Using the new OpenAI API format (v1.0.0+)
+            response = await aclient.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=build_changelog_messages(chunk),
+                max_tokens=2000,
+                temperature=0.7
+            )
+        return response.choices[0].message.content.strip()
     
     try:
-        # Using the new OpenAI API format (v1.0.0+)
-        client = OpenAI()
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are an expert technical writer specializing in user-facing changelogs for developer tools."},
-                {"role": "user", "content": CHANGELOG_PROMPT.format(commits=commits_text)}
-            ],
-            max_tokens=2000,
-            temperature=0.7
+        # One request per group of commits, sent concurrently
+        sections = await asyncio.gather(
+            *(summarize(chunk) for chunk in chunk_commits(commits, COMMITS_PER_REQUEST))
         )
-        logger.info("Generated changelog.")
-        return response.choices[0].message.content.strip()
+        logger.info(f"Generated changelog from {len(sections)} request(s).")
+        content = merge_changelog_sections(sections)
+        
+        with db_write_lock, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO ai_cache (key, content, created_at) VALUES (?, ?, ?)",
+                (cache_key, content, datetime.now().isoformat())
+            )
+        return content
     
     except Exception as e:
         import traceback
@@ -226,23 +614,26 @@ def generate_ai_changelog(commits: List[CommitInfo]) -> str:
         # Fall back to simple changelog generation
         return generate_simple_changelog(commits)
 
+def categorize_commit(message: str) -> str:
+    """Pick the highest-priority keyword category found in a commit message"""
+    best = None
+    for _, category in KEYWORD_AUTOMATON.iter(message.lower()):
+        if best is None or CATEGORY_PRIORITY[category] < CATEGORY_PRIORITY[best]:
+            best = category
+            if CATEGORY_PRIORITY[best] == 0:
+                break
+    return best or "other"
+
 def generate_simple_changelog(commits: List[CommitInfo]) -> str:
     """Fallback changelog generation without AI"""
     features = []
     fixes = []
     improvements = []
     other = []
+    sections = {"features": features, "fixes": fixes, "improvements": improvements, "other": other}
     
     for commit in commits:
-        msg = commit.message.lower()
-        if any(word in msg for word in ['feat', 'feature', 'add', 'new']):
-            features.append(f"- {commit.message}")
-        elif any(word in msg for word in ['fix', 'bug', 'resolve', 'patch']):
-            fixes.append(f"- {commit.message}")
-        elif any(word in msg for word in ['improve', 'enhance', 'update', 'optimize']):
-            improvements.append(f"- {commit.message}")
-        else:
-            other.append(f"- {commit.message}")
+        sections[categorize_commit(commit.message)].append(f"- {commit.message}")
     
     changelog = ""
     if features:
@@ -256,173 +647,420 @@ def generate_simple_changelog(commits: List[CommitInfo]) -> str:
     
     return changelog.strip()
 
-@app.post("/api/generate", response_model=GeneratedChangelog)
-async def generate_changelog(request: GenerateChangelogRequest):
-    """Generate a changelog from Git commits"""
-    try:
-        # Get commits from Git
-        commits = get_git_commits(
-            request.repo_path,
-            request.days,
-            request.from_commit,
-            request.to_commit
-        )
-        
-        if not commits:
-            raise HTTPException(status_code=404, detail="No commits found in the specified range")
-        
-        # Filter commits
-        filtered_commits = filter_commits(commits, request.exclude_patterns)
-        
-        if not filtered_commits:
-            raise HTTPException(status_code=404, detail="No relevant commits found after filtering")
-        
-        # Generate changelog content
-        changelog_content = generate_ai_changelog(filtered_commits)
-        
-        # Create title based on date range
-        if len(filtered_commits) > 0:
-            latest_date = datetime.fromisoformat(filtered_commits[0].date.replace('Z', '+00:00'))
-            title = f"Changes - {latest_date.strftime('%B %d, %Y')}"
-        else:
-            title = f"Changes - {datetime.now().strftime('%B %d, %Y')}"
-        
-        # Summary stats
-        summary = {
-            "total_commits": len(commits),
-            "filtered_commits": len(filtered_commits),
-            "authors": list(set(commit.author for commit in filtered_commits)),
-            "date_range": {
-                "from": filtered_commits[-1].date if filtered_commits else None,
-                "to": filtered_commits[0].date if filtered_commits else None
+async def submit_changelog_batch(commits: List[CommitInfo]):
+    """Upload one chat completion request per commit group and start an OpenAI batch"""
+    lines = []
+    for index, chunk in enumerate(chunk_commits(commits, COMMITS_PER_REQUEST)):
+        lines.append(json.dumps({
+            "custom_id": f"chunk-{index}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": OPENAI_MODEL,
+                "messages": build_changelog_messages(chunk),
+                "max_tokens": 2000,
+                "temperature": 0.7
             }
-        }
-        
-        return GeneratedChangelog(
-            title=title,
-            content=changelog_content,
-            raw_commits=filtered_commits,
-            summary=summary
-        )
-        
-    except git.exc.GitError as e:
-        raise HTTPException(status_code=400, detail=f"Git error: {str(e)}")
-    except Exception as e:
-        import traceback
-        error_traceback = traceback.format_exc()
-        logger.error(f"Error generating changelog: {e}\n{error_traceback}")
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}\nTraceback: {error_traceback}")
+        }))
+    
+    batch_file = await aclient.files.create(
+        file=("changelog-batch.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch"
+    )
+    return await aclient.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
 
-@app.post("/api/publish", response_model=ChangelogResponse)
-async def publish_changelog(request: PublishChangelogRequest):
-    """Publish a changelog to the public site"""
-    conn = get_db()
+async def collect_batch_output(batch, commits: List[CommitInfo]) -> str:
+    """Download a finished batch and merge its sections in commit-group order.
     
-    try:
+    Groups whose request failed get the simple changelog for their commits,
+    so the result always covers every commit in the job.
+    """
+    sections = {}
+    if batch.output_file_id:
+        output = await aclient.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            response = result.get("response") or {}
+            if response.get("status_code") != 200:
+                logger.error(f"Batch request {result.get('custom_id')} failed: {result.get('error') or response}")
+                continue
+            index = int(result["custom_id"].rsplit("-", 1)[1])
+            sections[index] = response["body"]["choices"][0]["message"]["content"].strip()
+    
+    # Requests that failed outright are only reported in the error file
+    if batch.error_file_id:
+        errors = await aclient.files.content(batch.error_file_id)
+        for line in errors.text.splitlines():
+            if line.strip():
+                result = json.loads(line)
+                logger.error(f"Batch request {result.get('custom_id')} failed: {result.get('error') or result.get('response')}")
+    
+    groups = list(chunk_commits(commits, COMMITS_PER_REQUEST))
+    missing = [index for index in range(len(groups)) if index not in sections]
+    if missing:
+        logger.warning(f"Batch {batch.id}: {len(missing)} of {len(groups)} group(s) failed, using simple changelog for them")
+        for index in missing:
+            sections[index] = generate_simple_changelog(groups[index])
+    
+    return merge_changelog_sections([sections[index] for index in range(len(groups))])
+
+def load_filtered_commits(request: GenerateChangelogRequest) -> Tuple[int, List[CommitInfo]]:
+    """Read commits for the requested range and drop the excluded ones"""
+    if request.commit_shas is not None:
+        if not request.commit_shas:
+            raise HTTPException(status_code=404, detail="No relevant commits found after filtering")
+        if not all(COMMIT_SHA_RE.fullmatch(sha) for sha in request.commit_shas):
+            raise HTTPException(status_code=400, detail="Invalid commit hash in commit_shas")
+    
+    # Plain-text patterns are dropped while the log is read; the rest are
+    # regexes checked on the commits that remain
+    stats = {"total": 0}
+    literal_patterns = [pattern for pattern in request.exclude_patterns if is_literal_pattern(pattern)]
+    regex_patterns = [pattern for pattern in request.exclude_patterns if not is_literal_pattern(pattern)]
+    
+    commits = get_git_commits(
+        request.repo_path,
+        request.days,
+        request.from_commit,
+        request.to_commit,
+        exclude_literals=literal_patterns,
+        commit_shas=request.commit_shas,
+        stats=stats
+    )
+    
+    # Filter commits as they are read; the total includes the commits
+    # skipped for plain-text patterns
+    filtered_commits = filter_commits(commits, regex_patterns)
+    total_commits = stats["total"]
+    
+    if not total_commits:
+        raise HTTPException(status_code=404, detail="No commits found in the specified range")
+    
+    if not filtered_commits:
+        raise HTTPException(status_code=404, detail="No relevant commits found after filtering")
+    
+    return total_commits, filtered_commits
+
+def changelog_title(filtered_commits: List[CommitInfo]) -> str:
+    """Create title based on date range"""
+    if len(filtered_commits) > 0:
+        latest_date = datetime.fromisoformat(filtered_commits[0].date.replace('Z', '+00:00'))
+        return f"Changes - {latest_date.strftime('%B %d, %Y')}"
+    return f"Changes - {datetime.now().strftime('%B %d, %Y')}"
+
+def changelog_summary(total_commits: int, filtered_commits: List[CommitInfo]) -> Dict[str, Any]:
+    """Summary stats for a generated changelog"""
+    # Commits arrive newest first, so the date range is read off the ends of
+    # the list and authors are the only full pass (kept in commit order)
+    return {
+        "total_commits": total_commits,
+        "filtered_commits": len(filtered_commits),
+        "authors": list(dict.fromkeys(commit.author for commit in filtered_commits)),
+        "date_range": {
+            "from": filtered_commits[-1].date if filtered_commits else None,
+            "to": filtered_commits[0].date if filtered_commits else None
+        }
+    }
+
+def insert_changelog(conn: sqlite3.Connection, version: str, title: str, content: str, raw_commits: str) -> sqlite3.Row:
+    """Store a published changelog and return its row"""
+    with db_write_lock, conn:
         # Check if version already exists
         existing = conn.execute(
             "SELECT id FROM changelogs WHERE version = ?",
-            (request.version,)
+            (version,)
         ).fetchone()
         
         if existing:
-            raise HTTPException(status_code=400, detail=f"Version {request.version} already exists")
+            raise HTTPException(status_code=400, detail=f"Version {version} already exists")
         
         # Insert new changelog
         cursor = conn.execute('''
             INSERT INTO changelogs (version, title, content, raw_commits, published_at, is_published)
             VALUES (?, ?, ?, ?, ?, ?)
         ''', (
-            request.version,
-            request.title,
-            request.content,
-            request.raw_commits,
+            version,
+            title,
+            content,
+            raw_commits,
             datetime.now().isoformat(),
             True
         ))
         
         changelog_id = cursor.lastrowid
-        conn.commit()
-        
-        # Return the created changelog
-        changelog = conn.execute(
-            "SELECT * FROM changelogs WHERE id = ?",
-            (changelog_id,)
-        ).fetchone()
-        
-        return ChangelogResponse(
-            id=changelog['id'],
-            version=changelog['version'],
-            title=changelog['title'],
-            content=changelog['content'],
-            created_at=changelog['created_at'],
-            published_at=changelog['published_at'],
-            is_published=bool(changelog['is_published'])
-        )
-        
-    finally:
-        conn.close()
+    
+    # Return the created changelog
+    return conn.execute(
+        "SELECT * FROM changelogs WHERE id = ?",
+        (changelog_id,)
+    ).fetchone()
 
-@app.get("/api/changelog", response_model=List[ChangelogResponse])
-async def get_changelogs(published_only: bool = True):
-    """Get all published changelogs"""
-    conn = get_db()
+def changelog_response(row: sqlite3.Row) -> ChangelogResponse:
+    # Rows come from our own schema, so field validation is skipped
+    return ChangelogResponse.model_construct(
+        id=row['id'],
+        version=row['version'],
+        title=row['title'],
+        content=row['content'],
+        created_at=row['created_at'],
+        published_at=row['published_at'],
+        is_published=bool(row['is_published'])
+    )
+
+def changelog_list_query(published_only: bool, limit: Optional[int] = None,
+                         cursor: Optional[int] = None) -> Tuple[str, List[Any]]:
+    """Newest first; cursor is the id of the last row of the previous page.
+    
+    Pages are ordered and keyed on id alone, which follows insert order, so
+    each page is a primary-key range scan rather than an index scan from the
+    newest row.
+    """
+    query = "SELECT * FROM changelogs"
+    conditions = []
+    params = []
+    
+    if published_only:
+        conditions.append("is_published = ?")
+        params.append(True)
+    if cursor is not None:
+        conditions.append("id < ?")
+        params.append(cursor)
+    
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    # The unpaged list keeps the idx_published_created plan
+    if limit is None and cursor is None:
+        query += " ORDER BY created_at DESC"
+    else:
+        query += " ORDER BY id DESC"
+    
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    return query, params
+
+def changelog_list_etag(conn: sqlite3.Connection, published_only: bool) -> str:
+    """Validator for the changelog list; rows are only ever inserted, so the
+    count and highest id change whenever the list does"""
+    query = "SELECT COUNT(*), MAX(id) FROM changelogs"
+    params = []
+    
+    if published_only:
+        query += " WHERE is_published = ?"
+        params.append(True)
     
+    count, max_id = conn.execute(query, params).fetchone()
+    return f'W/"{int(published_only)}-{count}-{max_id or 0}"'
+
+def batch_job_response(row: sqlite3.Row) -> BatchJobResponse:
+    return BatchJobResponse(
+        id=row['id'],
+        status=row['status'],
+        title=row['title'],
+        content=row['content'],
+        raw_commits=json.loads(row['raw_commits']),
+        summary=json.loads(row['summary']),
+        created_at=row['created_at'],
+        completed_at=row['completed_at']
+    )
+
+@app.post("/api/generate", response_model=GeneratedChangelog)
+async def generate_changelog(request: GenerateChangelogRequest):
+    """Generate a changelog from Git commits"""
     try:
-        query = "SELECT * FROM changelogs"
-        params = []
+        # Git traversal runs in a worker thread to keep the event loop free
+        total_commits, filtered_commits = await asyncio.to_thread(load_filtered_commits, request)
         
-        if published_only:
-            query += " WHERE is_published = ?"
-            params.append(True)
+        # Generate changelog content
+        changelog_content = await generate_ai_changelog(filtered_commits)
         
-        query += " ORDER BY created_at DESC"
+        # Returned as a ready-made response: the commits are already validated,
+        # so FastAPI's response_model pass (kept for the docs) is skipped
+        return ORJSONResponse(content={
+            "title": changelog_title(filtered_commits),
+            "content": changelog_content,
+            "raw_commits": [commit.model_dump() for commit in filtered_commits],
+            "summary": changelog_summary(total_commits, filtered_commits)
+        })
         
-        rows = conn.execute(query, params).fetchall()
+    except HTTPException:
+        raise
+    except git.exc.GitError as e:
+        raise HTTPException(status_code=400, detail=f"Git error: {str(e)}")
+    except Exception as e:
+        import traceback
+        error_traceback = traceback.format_exc()
+        logger.error(f"Error generating changelog: {e}\n{error_traceback}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}\nTraceback: {error_traceback}")
+
+@app.post("/api/generate/batch", response_model=BatchJobResponse)
+async def generate_changelog_batch(request: GenerateChangelogRequest, conn: sqlite3.Connection = Depends(get_db)):
+    """Start a changelog job, using the OpenAI Batch API for large commit sets"""
+    try:
+        # Git traversal runs in a worker thread to keep the event loop free
+        total_commits, filtered_commits = await asyncio.to_thread(load_filtered_commits, request)
+        
+        if openai_api_key and len(filtered_commits) > BATCH_THRESHOLD:
+            batch = await submit_changelog_batch(filtered_commits)
+            job_id, status, content, completed_at = batch.id, batch.status, None, None
+        else:
+            # Small commit sets are cheap enough to summarize synchronously
+            job_id = f"sync-{uuid.uuid4().hex}"
+            status, completed_at = "completed", datetime.now().isoformat()
+            content = await generate_ai_changelog(filtered_commits)
         
-        changelogs = []
-        for row in rows:
-            changelogs.append(ChangelogResponse(
-                id=row['id'],
-                version=row['version'],
-                title=row['title'],
-                content=row['content'],
-                created_at=row['created_at'],
-                published_at=row['published_at'],
-                is_published=bool(row['is_published'])
+        with db_write_lock, conn:
+            conn.execute('''
+                INSERT INTO batch_jobs (id, status, title, content, raw_commits, summary, completed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                job_id,
+                status,
+                changelog_title(filtered_commits),
+                content,
+                json.dumps([commit.model_dump() for commit in filtered_commits]),
+                json.dumps(changelog_summary(total_commits, filtered_commits)),
+                completed_at
             ))
         
-        return changelogs
+        row = conn.execute("SELECT * FROM batch_jobs WHERE id = ?", (job_id,)).fetchone()
+        return batch_job_response(row)
         
-    finally:
-        conn.close()
+    except HTTPException:
+        raise
+    except git.exc.GitError as e:
+        raise HTTPException(status_code=400, detail=f"Git error: {str(e)}")
+    except Exception as e:
+        import traceback
+        error_traceback = traceback.format_exc()
+        logger.error(f"Error starting changelog batch: {e}\n{error_traceback}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
-@app.get("/api/changelog/{version}", response_model=ChangelogResponse)
-async def get_changelog_by_version(version: str):
-    """Get a specific changelog by version"""
-    conn = get_db()
+@app.get("/api/generate/batch/{batch_id}", response_model=BatchJobResponse)
+async def get_changelog_batch(batch_id: str, conn: sqlite3.Connection = Depends(get_db)):
+    """Poll a changelog batch job, downloading its output once OpenAI finishes"""
+    row = conn.execute("SELECT * FROM batch_jobs WHERE id = ?", (batch_id,)).fetchone()
+    
+    if not row:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    
+    if row['status'] in BATCH_TERMINAL_STATUSES or not openai_api_key:
+        return batch_job_response(row)
+    
+    batch = await aclient.batches.retrieve(batch_id)
+    
+    content, completed_at = None, None
+    if batch.status in BATCH_TERMINAL_STATUSES:
+        completed_at = datetime.now().isoformat()
+    if batch.status == "completed":
+        commits = [CommitInfo(**commit) for commit in json.loads(row['raw_commits'])]
+        content = await collect_batch_output(batch, commits)
+    
+    with db_write_lock, conn:
+        conn.execute(
+            "UPDATE batch_jobs SET status = ?, content = ?, completed_at = ? WHERE id = ?",
+            (batch.status, content, completed_at, batch_id)
+        )
+    
+    row = conn.execute("SELECT * FROM batch_jobs WHERE id = ?", (batch_id,)).fetchone()
+    return batch_job_response(row)
+
+@app.post("/api/publish", response_model=ChangelogResponse)
+async def publish_changelog(request: PublishChangelogRequest, conn: sqlite3.Connection = Depends(get_db)):
+    """Publish a changelog to the public site"""
+    changelog = insert_changelog(conn, request.version, request.title, request.content, request.raw_commits)
+    return changelog_response(changelog)
+
+@app.post("/api/generate_and_publish", response_model=ChangelogResponse)
+async def generate_and_publish_changelog(request: GenerateAndPublishRequest, conn: sqlite3.Connection = Depends(get_db)):
+    """Generate a changelog from Git commits and publish it in a single request"""
+    # Fail fast before paying for generation
+    if conn.execute("SELECT id FROM changelogs WHERE version = ?", (request.version,)).fetchone():
+        raise HTTPException(status_code=400, detail=f"Version {request.version} already exists")
     
     try:
-        row = conn.execute(
-            "SELECT * FROM changelogs WHERE version = ? AND is_published = ?",
-            (version, True)
-        ).fetchone()
+        # Git traversal runs in a worker thread to keep the event loop free
+        total_commits, filtered_commits = await asyncio.to_thread(load_filtered_commits, request)
         
-        if not row:
-            raise HTTPException(status_code=404, detail="Changelog not found")
+        changelog_content = await generate_ai_changelog(filtered_commits)
         
-        return ChangelogResponse(
-            id=row['id'],
-            version=row['version'],
-            title=row['title'],
-            content=row['content'],
-            created_at=row['created_at'],
-            published_at=row['published_at'],
-            is_published=bool(row['is_published'])
+        changelog = insert_changelog(
+            conn,
+            request.version,
+            request.title or changelog_title(filtered_commits),
+            changelog_content,
+            orjson.dumps([commit.model_dump() for commit in filtered_commits]).decode()
         )
+        return changelog_response(changelog)
         
-    finally:
-        conn.close()
+    except HTTPException:
+        raise
+    except git.exc.GitError as e:
+        raise HTTPException(status_code=400, detail=f"Git error: {str(e)}")
+    except Exception as e:
+        import traceback
+        error_traceback = traceback.format_exc()
+        logger.error(f"Error generating and publishing changelog: {e}\n{error_traceback}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@app.get("/api/changelog", response_model=List[ChangelogResponse])
+async def get_changelogs(request: Request, response: Response, published_only: bool = True,
+                         limit: Optional[int] = Query(None, ge=1, le=500), cursor: Optional[int] = None,
+                         conn: sqlite3.Connection = Depends(get_db)):
+    """Get all published changelogs, optionally one page at a time"""
+    etag = changelog_list_etag(conn, published_only)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
+    query, params = changelog_list_query(published_only, limit, cursor)
+    return [changelog_response(row) for row in conn.execute(query, params)]
+
+@app.get("/api/changelog/stream")
+async def stream_changelogs(published_only: bool = True, conn: sqlite3.Connection = Depends(get_db)):
+    """Stream changelogs as newline-delimited JSON, one row at a time"""
+    query, params = changelog_list_query(published_only)
+    
+    def lines():
+        for row in conn.execute(query, params):
+            yield orjson.dumps(changelog_response(row).model_dump()) + b"\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@app.get("/api/changelog/{version}", response_model=ChangelogResponse)
+async def get_changelog_by_version(version: str, conn: sqlite3.Connection = Depends(get_db)):
+    """Get a specific changelog by version"""
+    row = conn.execute(
+        "SELECT * FROM changelogs WHERE version = ? AND is_published = ?",
+        (version, True)
+    ).fetchone()
+    
+    if not row:
+        raise HTTPException(status_code=404, detail="Changelog not found")
+    
+    return changelog_response(row)
+
+# Health probes share one database snapshot per HEALTH_CACHE_SECONDS window
+HEALTH_CACHE_SECONDS = 5
+
+def health_bucket() -> int:
+    return int(time.time() // HEALTH_CACHE_SECONDS)
+
+@lru_cache(maxsize=4)
+def health_snapshot(bucket: int) -> Dict[str, Any]:
+    row = get_db().execute(
+        "SELECT COUNT(*) AS row_count, MAX(created_at) AS last_created_at FROM changelogs"
+    ).fetchone()
+    return {
+        "changelog_count": row['row_count'],
+        "last_changelog_created_at": row['last_created_at']
+    }
 
 @app.get("/api/health")
 async def health_check():
@@ -430,7 +1068,8 @@ async def health_check():
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "openai_configured": bool(openai.api_key)
+        "openai_configured": bool(openai_api_key),
+        **health_snapshot(health_bucket())
     }
 
 if __name__ == "__main__":
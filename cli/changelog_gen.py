@@ -5,104 +5,264 @@ A developer tool for generating user-friendly changelogs from Git commits.
 """
 
 import click
-import requests
+import atexit
+import functools
+import hashlib
 import json
 import os
+import pickle
+import re
 import sys
 import tempfile
-import subprocess
+import uuid
+from datetime import datetime, timedelta
 from pathlib import Path
+from types import MappingProxyType
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.panel import Panel
-from rich.markdown import Markdown
-from rich.prompt import Prompt, Confirm
-from rich.table import Table
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Mapping
+
+# requests, subprocess and the heavier rich modules are imported where they
+# are used, so commands like --help, init and config start quickly
+
+try:
+    import orjson
+except ImportError:  # optional, speeds up API payloads
+    orjson = None
 
 console = Console()
 
-# Configuration
-DEFAULT_CONFIG = {
+# Default exclude patterns, compiled once for the local filter
+_EXCLUDE_TUPLE = tuple(sys.intern(pattern) for pattern in (
+    "^chore:",
+    "^docs:",
+    "^test:",
+    "Merge pull request",
+    "^ci:",
+    "^build:"
+))
+_COMPILED_EXCLUDES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in _EXCLUDE_TUPLE)
+
+# Configuration, read-only so it can be shared without copying
+DEFAULT_CONFIG = MappingProxyType({
     "api_base_url": "http://localhost:8000",
     "editor": os.environ.get("EDITOR", "nano"),
-    "exclude_patterns": [
-        "^chore:",
-        "^docs:",
-        "^test:",
-        "Merge pull request",
-        "^ci:",
-        "^build:"
-    ],
-    "categories": {
+    "exclude_patterns": _EXCLUDE_TUPLE,
+    "categories": MappingProxyType({
         "features": "🚀 New Features",
         "bugfixes": "🐛 Bug Fixes",
         "improvements": "💡 Improvements",
         "breaking": "⚠️ Breaking Changes"
-    }
-}
+    })
+})
 
 CONFIG_FILE = ".changelog-config.json"
 
-def load_config() -> Dict[str, Any]:
-    """Load configuration from file or use defaults"""
-    config = DEFAULT_CONFIG.copy()
+# One pooled keep-alive session for every API call in this process.
+# Generation can take a while, hence the long read timeout.
+REQUEST_TIMEOUT = (5, 300)
+_SESSION = None
+
+def _get_session():
+    """Create the shared HTTP session on first use"""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        _SESSION = requests.Session()
+        _SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        _SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        atexit.register(_SESSION.close)
+    return _SESSION
+
+# Parsed GET responses that carried an ETag, revalidated with If-None-Match
+CACHE_DIR = Path.home() / ".cache" / "changelog-gen"
+
+def _response_cache_path(url: str) -> Path:
+    return CACHE_DIR / (hashlib.sha1(url.encode("utf-8")).hexdigest() + ".pickle")
+
+def _load_cached_response(url: str) -> Optional[tuple]:
+    """Return (etag, data) stored for url, if any"""
+    try:
+        with open(_response_cache_path(url), 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+def _store_cached_response(url: str, etag: str, data: Any):
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(_response_cache_path(url), 'wb') as f:
+            pickle.dump((etag, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+
+def _dump_json(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode("utf-8")
+
+def _load_json(content: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+# Scratch files for this run share one directory, removed at exit
+_TMPDIR = None
+
+def _tmp_path(suffix: str = ".md") -> Path:
+    """Fresh path inside the per-process scratch directory"""
+    global _TMPDIR
+    if _TMPDIR is None:
+        _TMPDIR = tempfile.TemporaryDirectory(prefix="changelog-gen-")
+        atexit.register(_TMPDIR.cleanup)
+    return Path(_TMPDIR.name) / f"cl-{uuid.uuid4().hex}{suffix}"
+
+# Style tags used in this module's messages, dropped for plain output
+_MARKUP_RE = re.compile(r"\[/?(?:bold|red|green|yellow|blue|cyan)?\]")
+
+def json_output() -> bool:
+    """Whether the root --output-format option asked for JSON"""
+    ctx = click.get_current_context(silent=True)
+    obj = ctx.find_object(dict) if ctx is not None else None
+    return obj is not None and obj.get('fmt') == "json"
+
+def emit_json(data: Any):
+    """Write data to stdout as one JSON document, bypassing rich"""
+    sys.stdout.flush()
+    sys.stdout.buffer.write(_dump_json(data) + b"\n")
+    sys.stdout.buffer.flush()
+
+def out(message: str = ""):
+    """Print a status message; plain click.echo when not writing to a terminal.
+    
+    In JSON output mode messages go to stderr so stdout stays parseable.
+    """
+    if json_output():
+        click.echo(click.unstyle(_MARKUP_RE.sub("", message)), err=True)
+    elif console.is_terminal:
+        console.print(message)
+    else:
+        click.echo(click.unstyle(_MARKUP_RE.sub("", message)))
+
+def _progress():
+    """Spinner shown while waiting on the API"""
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+    )
+
+# Parsed configuration keyed by (path, mtime, size) of the config file
+_CONFIG_CACHE: Dict[tuple, Mapping[str, Any]] = {}
+
+def load_config() -> Mapping[str, Any]:
+    """Load configuration from file or use defaults.
+    
+    Without a config file the read-only DEFAULT_CONFIG itself is returned.
+    """
+    try:
+        stat = os.stat(CONFIG_FILE)
+        key = (CONFIG_FILE, stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        key = (CONFIG_FILE, None, None)
     
-    if os.path.exists(CONFIG_FILE):
+    if key in _CONFIG_CACHE:
+        return _CONFIG_CACHE[key]
+    
+    config = DEFAULT_CONFIG
+    
+    if key[1] is not None:
         try:
             with open(CONFIG_FILE, 'r') as f:
                 user_config = json.load(f)
-                config.update(user_config)
+            config = {**DEFAULT_CONFIG, **user_config}
         except Exception as e:
-            console.print(f"[yellow]Warning: Could not load config file: {e}[/yellow]")
+            out(f"[yellow]Warning: Could not load config file: {e}[/yellow]")
     
+    _CONFIG_CACHE.clear()
+    _CONFIG_CACHE[key] = config
     return config
 
 def save_config(config: Dict[str, Any]):
     """Save configuration to file"""
     try:
         with open(CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=2)
-        console.print(f"[green]Configuration saved to {CONFIG_FILE}[/green]")
+            json.dump(config, f, indent=2, default=dict)
+        _CONFIG_CACHE.clear()
+        out(f"[green]Configuration saved to {CONFIG_FILE}[/green]")
     except Exception as e:
-        console.print(f"[red]Error saving config: {e}[/red]")
+        out(f"[red]Error saving config: {e}[/red]")
 
-def make_api_request(endpoint: str, method: str = "GET", data: Dict = None) -> Dict:
-    """Make API request to the backend"""
-    config = load_config()
+def make_api_request(endpoint: str, method: str = "GET", data: Dict = None, *,
+                     config: Optional[Mapping[str, Any]] = None, use_cache: bool = True) -> Dict:
+    """Make API request to the backend.
+    
+    GET responses with an ETag are cached on disk and revalidated on the next
+    call; pass use_cache=False to ignore the cached copy.
+    """
+    import requests
+    
+    config = config or load_config()
     url = f"{config['api_base_url']}/api/{endpoint}"
     
-    try:
-        if method == "GET":
-            response = requests.get(url)
-        elif method == "POST":
-            response = requests.post(url, json=data)
-        else:
-            raise ValueError(f"Unsupported method: {method}")
-        
-        response.raise_for_status()
-        return response.json()
+    cached = None
+    body = None
+    headers = None
+    if method == "GET":
+        cached = _load_cached_response(url) if use_cache else None
+        if cached:
+            headers = {"If-None-Match": cached[0]}
+    elif method == "POST":
+        body = _dump_json(data)
+        headers = {"Content-Type": "application/json"}
+    else:
+        raise ValueError(f"Unsupported method: {method}")
     
+    try:
+        response = _get_session().request(method, url, data=body, headers=headers, timeout=REQUEST_TIMEOUT)
     except requests.exceptions.ConnectionError:
-        console.print("[red]Error: Could not connect to the changelog API server.[/red]")
-        console.print("Make sure the backend server is running on http://localhost:8000")
+        out("[red]Error: Could not connect to the changelog API server.[/red]")
+        out("Make sure the backend server is running on http://localhost:8000")
         sys.exit(1)
-    except requests.exceptions.HTTPError as e:
-        console.print(f"[red]API Error: {e.response.status_code} - {e.response.text}[/red]")
+    except requests.exceptions.RequestException as e:
+        out(f"[red]Unexpected error: {e}[/red]")
         sys.exit(1)
-    except Exception as e:
-        console.print(f"[red]Unexpected error: {e}[/red]")
+    
+    if cached and response.status_code == 304:
+        return cached[1]
+    if not response.ok:
+        out(f"[red]API Error: {response.status_code} - {response.text}[/red]")
         sys.exit(1)
+    
+    try:
+        result = _load_json(response.content)
+    except ValueError as e:
+        out(f"[red]Unexpected error: invalid JSON from the API ({e})[/red]")
+        sys.exit(1)
+    
+    if method == "GET" and "ETag" in response.headers:
+        _store_cached_response(url, response.headers["ETag"], result)
+    return result
 
-@click.group()
+@click.group(context_settings=dict(max_content_width=120))
 @click.version_option(version="1.0.0", prog_name="changelog-gen")
-def cli():
+@click.option("--output-format", type=click.Choice(["rich", "json"]), default="rich",
+              help="Render results with rich, or print raw JSON for scripts (list, show, server)")
+@click.pass_context
+def cli(ctx, output_format: str):
     """
     AI-Powered Changelog Generator
     
     Generate user-friendly changelogs from Git commits using AI.
     """
-    pass
+    # Loaded once and shared by every subcommand
+    ctx.ensure_object(dict)
+    # Set first so config warnings already go to stderr in JSON mode
+    ctx.obj['fmt'] = output_format
+    ctx.obj['config'] = load_config()
 
 @cli.command()
 @click.option("--days", "-d", default=7, help="Number of days to look back for commits")
@@ -111,11 +271,17 @@ def cli():
 @click.option("--repo-path", "-r", default=".", help="Path to Git repository")
 @click.option("--preview", "-p", is_flag=True, help="Preview without saving")
 @click.option("--output", "-o", help="Output file path")
-def generate(days: int, from_commit: Optional[str], to_commit: Optional[str], 
-             repo_path: str, preview: bool, output: Optional[str]):
+@click.option("--local-filter", is_flag=True, help="Filter commits with the local Git checkout before calling the API")
+@click.pass_context
+def generate(ctx, days: int, from_commit: Optional[str], to_commit: Optional[str], 
+             repo_path: str, preview: bool, output: Optional[str], local_filter: bool):
     """Generate a changelog from Git commits"""
+    from rich.markdown import Markdown
+    from rich.panel import Panel
+    from rich.prompt import Confirm
+    from rich.table import Table
     
-    config = load_config()
+    config = ctx.obj['config']
     
     # Prepare request data
     request_data = {
@@ -129,24 +295,31 @@ def generate(days: int, from_commit: Optional[str], to_commit: Optional[str],
     if to_commit:
         request_data["to_commit"] = to_commit
     
+    local_commits = None
+    if local_filter:
+        local_commits = filter_local_commits(repo_path, days, from_commit, to_commit, config["exclude_patterns"])
+        if local_commits is None:
+            out("[yellow]Local filtering unavailable, the server will filter commits[/yellow]")
+        else:
+            # The server reads only the surviving commits
+            request_data["commit_shas"] = local_commits[0]
+    
     # Show what we're doing
     if from_commit and to_commit:
-        console.print(f"[blue]Generating changelog from {from_commit} to {to_commit}...[/blue]")
+        out(f"[blue]Generating changelog from {from_commit} to {to_commit}...[/blue]")
     else:
-        console.print(f"[blue]Generating changelog for the last {days} days...[/blue]")
+        out(f"[blue]Generating changelog for the last {days} days...[/blue]")
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+    with _progress() as progress:
         task = progress.add_task("Analyzing commits and generating changelog...", total=None)
         
         # Make API request
-        result = make_api_request("generate", "POST", request_data)
+        result = make_api_request("generate", "POST", request_data, config=config)
     
     # Display summary
     summary = result["summary"]
+    if local_commits is not None:
+        summary["total_commits"] = local_commits[1]
     table = Table(title="Changelog Generation Summary")
     table.add_column("Metric", style="cyan")
     table.add_column("Value", style="green")
@@ -166,36 +339,121 @@ def generate(days: int, from_commit: Optional[str], to_commit: Optional[str],
     ))
     
     if preview:
-        console.print("[yellow]Preview mode - changelog not saved[/yellow]")
+        out("[yellow]Preview mode - changelog not saved[/yellow]")
         return
     
     # Save or edit changelog
     if output:
         # Save to specified file
         with open(output, 'w', encoding='utf-8') as f:
-            f.write(f"# {result['title']}\n\n{result['content']}")
-        console.print(f"[green]Changelog saved to {output}[/green]")
+            f.write("# ")
+            f.write(result['title'])
+            f.write("\n\n")
+            f.write(result['content'])
+        out(f"[green]Changelog saved to {output}[/green]")
+    else:
+        # Open in editor for review; the edited file is kept as the saved copy
+        if not sys.stdin.isatty() or not Confirm.ask("Would you like to review and edit the changelog?"):
+            out("[yellow]Changelog not saved[/yellow]")
+            return
+        _, _, temp_path = edit_changelog(result['title'], result['content'], config)
+        if temp_path:
+            # Move it out of the scratch directory so it outlives this run
+            saved_path = os.path.join(tempfile.gettempdir(), os.path.basename(temp_path))
+            os.replace(temp_path, saved_path)
+            out(f"[green]Changelog saved to {saved_path}[/green]")
+
+@functools.lru_cache(maxsize=8)
+def compiled_excludes(patterns: tuple) -> tuple:
+    """Compile exclude patterns once per distinct pattern set"""
+    if patterns == _EXCLUDE_TUPLE:
+        return _COMPILED_EXCLUDES
+    return tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+
+def filter_local_commits(repo_path: str, days: int, from_commit: Optional[str], to_commit: Optional[str],
+                         exclude_patterns: list) -> Optional[tuple]:
+    """Apply exclude patterns with the local Git checkout.
+    
+    Returns the surviving commit hashes and the number of commits seen, or
+    None if the repository can't be read locally or a pattern doesn't
+    compile, leaving the server to filter (and report the bad pattern).
+    """
+    import subprocess
+    
+    try:
+        compiled = compiled_excludes(tuple(exclude_patterns))
+    except re.error as e:
+        out(f"[yellow]Invalid exclude pattern: {e}[/yellow]")
+        return None
+    
+    # Same range the server would select
+    if from_commit and to_commit:
+        range_args = [f"{from_commit}..{to_commit}"]
     else:
-        # Open in editor for review
-        if Confirm.ask("Would you like to review and edit the changelog?"):
-            edit_changelog(result['title'], result['content'])
-        # Save to temporary file and show path
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False, encoding='utf-8') as f:
-            f.write(f"# {result['title']}\n\n{result['content']}")
-            temp_path = f.name
-        console.print(f"[green]Changelog saved to {temp_path}[/green]")
-
-def edit_changelog(title: str, content: str) -> tuple[str, str]:
-    """Open changelog in editor for review"""
-    config = load_config()
-    
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False, encoding='utf-8') as f:
-        f.write(f"# {title}\n\n{content}")
-        temp_path = f.name
+        since_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        since_date = since_date - timedelta(days=days)
+        range_args = [f"--since={since_date.isoformat()}", "HEAD"]
+    
+    try:
+        log = subprocess.run(
+            ["git", "-C", repo_path, "log", "-z", "--format=%H%n%B", *range_args],
+            capture_output=True,
+            check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    
+    shas = []
+    total = 0
+    for record in log.stdout.decode("utf-8", errors="replace").split("\0"):
+        if not record:
+            continue
+        total += 1
+        sha, _, message = record.partition("\n")
+        if not any(pattern.search(message.strip()) for pattern in compiled):
+            shas.append(sha)
+    
+    return shas, total
+
+def run_editor(editor: str, path: str):
+    """Run the editor on path and wait for it to exit"""
+    import subprocess
+    
+    if not hasattr(os, "posix_spawnp"):
+        subprocess.run([editor, path], check=True)
+        return
+    
+    # posix_spawn skips the fork of this interpreter that subprocess may do
+    pid = os.posix_spawnp(editor, [editor, path], os.environ)
+    _, status = os.waitpid(pid, 0)
+    if os.WIFSIGNALED(status):
+        raise subprocess.CalledProcessError(-os.WTERMSIG(status), [editor, path])
+    if os.WEXITSTATUS(status):
+        raise subprocess.CalledProcessError(os.WEXITSTATUS(status), [editor, path])
+
+def edit_changelog(title: str, content: str, config: Mapping[str, Any]) -> tuple[str, str, Optional[str]]:
+    """Open changelog in editor for review.
+    
+    The edited file is left in the scratch directory and its path returned
+    with the title and content; callers that want to keep it must move it
+    out before exit. Without a terminal on stdin the editor isn't launched
+    and nothing is written.
+    """
+    import subprocess
+    
+    if not sys.stdin.isatty():
+        return title, content, None
+    
+    # Private to the user, like NamedTemporaryFile, since generate may move
+    # the file into the shared temp dir
+    temp_path = str(_tmp_path())
+    fd = os.open(temp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8', buffering=1 << 16) as f:
+        f.writelines(("# ", title, "\n\n", content))
     
     try:
         # Open in editor
-        subprocess.run([config["editor"], temp_path], check=True)
+        run_editor(config["editor"], temp_path)
         
         # Read back the edited content
         with open(temp_path, 'r', encoding='utf-8') as f:
@@ -209,26 +467,26 @@ def edit_changelog(title: str, content: str) -> tuple[str, str]:
         else:
             edited_title = title
         
-        os.unlink(temp_path)
-        return edited_title, edited_content
+        return edited_title, edited_content, temp_path
         
     except subprocess.CalledProcessError:
-        console.print("[red]Error opening editor[/red]")
-        os.unlink(temp_path)
-        return title, content
+        out("[red]Error opening editor[/red]")
+        return title, content, temp_path
     except Exception as e:
-        console.print(f"[red]Error editing changelog: {e}[/red]")
-        if os.path.exists(temp_path):
-            os.unlink(temp_path)
-        return title, content
+        out(f"[red]Error editing changelog: {e}[/red]")
+        return title, content, temp_path if os.path.exists(temp_path) else None
 
 @cli.command()
 @click.option("--version", "-v", required=True, help="Version number for the changelog")
 @click.option("--title", "-t", help="Custom title for the changelog")
 @click.option("--file", "-f", help="Changelog file to publish")
 @click.option("--repo-path", "-r", default=".", help="Path to Git repository")
-def publish(version: str, title: Optional[str], file: Optional[str], repo_path: str):
+@click.pass_context
+def publish(ctx, version: str, title: Optional[str], file: Optional[str], repo_path: str):
     """Publish a changelog to the public website"""
+    from rich.prompt import Confirm
+    
+    config = ctx.obj['config']
     
     if file:
         # Read changelog from file
@@ -245,45 +503,61 @@ def publish(version: str, title: Optional[str], file: Optional[str], repo_path:
                 else:
                     title = f"Release {version}"
         except FileNotFoundError:
-            console.print(f"[red]Error: File {file} not found[/red]")
+            out(f"[red]Error: File {file} not found[/red]")
             sys.exit(1)
         except Exception as e:
-            console.print(f"[red]Error reading file: {e}[/red]")
+            out(f"[red]Error reading file: {e}[/red]")
             sys.exit(1)
     else:
         # Interactive mode - generate and edit
-        console.print("[blue]No file specified. Generating changelog...[/blue]")
+        out("[blue]No file specified. Generating changelog...[/blue]")
         days = click.prompt("Number of days to look back", default=7, type=int)
         
         request_data = {
             "repo_path": repo_path,
             "days": days,
-            "exclude_patterns": load_config()["exclude_patterns"]
+            "exclude_patterns": config["exclude_patterns"]
         }
         
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            task = progress.add_task("Generating changelog...", total=None)
-            result = make_api_request("generate", "POST", request_data)
+        # Without a terminal there is no one to edit, so skip straight to publishing
+        wants_edit = sys.stdin.isatty() and Confirm.ask("Would you like to review and edit the changelog before publishing?")
+        if not wants_edit:
+            # Nothing to edit locally, so generate and publish in one request
+            out(f"\n[bold]About to generate and publish:[/bold]")
+            out(f"[cyan]Version:[/cyan] {version}")
+            if title:
+                out(f"[cyan]Title:[/cyan] {title}")
+            
+            if not Confirm.ask("\nProceed with publication?"):
+                out("[yellow]Publication cancelled[/yellow]")
+                return
+            
+            request_data["version"] = version
+            if title:
+                request_data["title"] = title
+            
+            with _progress() as progress:
+                task = progress.add_task("Generating and publishing changelog...", total=None)
+                result = make_api_request("generate_and_publish", "POST", request_data, config=config)
+            
+            print_published(result, version, config)
+            return
         
-        # Let user edit
-        title = title or result["title"]
-        content = result["content"]
+        with _progress() as progress:
+            task = progress.add_task("Generating changelog...", total=None)
+            result = make_api_request("generate", "POST", request_data, config=config)
         
-        if Confirm.ask("Would you like to review and edit the changelog before publishing?"):
-            title, content = edit_changelog(title, content)
+        # Let user edit; the scratch file goes with the scratch directory
+        title, content, _ = edit_changelog(title or result["title"], result["content"], config)
     
     # Confirm publication
-    console.print(f"\n[bold]About to publish:[/bold]")
-    console.print(f"[cyan]Version:[/cyan] {version}")
-    console.print(f"[cyan]Title:[/cyan] {title}")
-    console.print(f"[cyan]Content length:[/cyan] {len(content)} characters")
+    out(f"\n[bold]About to publish:[/bold]")
+    out(f"[cyan]Version:[/cyan] {version}")
+    out(f"[cyan]Title:[/cyan] {title}")
+    out(f"[cyan]Content length:[/cyan] {len(content)} characters")
     
     if not Confirm.ask("\nProceed with publication?"):
-        console.print("[yellow]Publication cancelled[/yellow]")
+        out("[yellow]Publication cancelled[/yellow]")
         return
     
     # Publish to API
@@ -291,66 +565,122 @@ def publish(version: str, title: Optional[str], file: Optional[str], repo_path:
         "version": version,
         "title": title,
         "content": content,
-        "raw_commits": json.dumps([])  # TODO: Include raw commits if available
+        "raw_commits": "[]"  # TODO: Include raw commits if available
     }
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+    with _progress() as progress:
         task = progress.add_task("Publishing changelog...", total=None)
-        result = make_api_request("publish", "POST", request_data)
+        result = make_api_request("publish", "POST", request_data, config=config)
     
-    console.print(f"[green]✅ Changelog published successfully![/green]")
-    console.print(f"[cyan]Version:[/cyan] {result['version']}")
-    console.print(f"[cyan]Published at:[/cyan] {result['published_at']}")
+    print_published(result, version, config)
+
+def print_published(result: Dict[str, Any], version: str, config: Mapping[str, Any]):
+    """Report a successful publication"""
+    out(f"[green]✅ Changelog published successfully![/green]")
+    out(f"[cyan]Version:[/cyan] {result['version']}")
+    out(f"[cyan]Published at:[/cyan] {result['published_at']}")
     
     # Show public URL if configured
-    config = load_config()
     if "public_url" in config:
         public_url = f"{config['public_url']}/{version}"
-        console.print(f"[cyan]Public URL:[/cyan] {public_url}")
+        out(f"[cyan]Public URL:[/cyan] {public_url}")
 
 @cli.command()
-def list():
+@click.option("--no-cache", is_flag=True, help="Fetch the full list even if it hasn't changed")
+@click.option("--limit", "-l", default=50, type=click.IntRange(1, 500), help="Changelogs per page")
+@click.option("--page/--no-page", default=True, help="Ask before fetching each further page")
+@click.pass_context
+def list(ctx, no_cache: bool, limit: int, page: bool):
     """List all published changelogs"""
+    from rich.prompt import Confirm
+    
+    # JSON mode collects every page into one array
+    collected = [] if ctx.obj['fmt'] == "json" else None
+    # Piped output gets plain tab-separated rows and no status chatter
+    tabular = not console.is_terminal
+    if not tabular:
+        out("[blue]Fetching published changelogs...[/blue]")
+    interactive = page and sys.stdin.isatty() and collected is None
+    cursor = None
+    
+    while True:
+        endpoint = f"changelog?limit={limit}"
+        if cursor is not None:
+            endpoint += f"&cursor={cursor}"
+        changelogs = make_api_request(endpoint, config=ctx.obj['config'], use_cache=not no_cache)
+        
+        if not changelogs:
+            if cursor is None and collected is None:
+                if tabular:
+                    click.echo("No published changelogs found", err=True)
+                else:
+                    out("[yellow]No published changelogs found[/yellow]")
+            break
+        
+        if collected is not None:
+            collected.extend(changelogs)
+        elif tabular:
+            for changelog in changelogs:
+                published_date = changelog['published_at'][:10] if changelog['published_at'] else 'N/A'
+                click.echo(f"{changelog['version']}\t{changelog['title']}\t{published_date}")
+        else:
+            print_changelog_table(changelogs)
+        
+        # A short page is the last one
+        if len(changelogs) < limit:
+            break
+        cursor = changelogs[-1]['id']
+        if interactive and not Confirm.ask("Show the next page?", default=True):
+            break
+    
+    if collected is not None:
+        emit_json(collected)
+
+def print_changelog_table(changelogs: List[Dict[str, Any]]):
+    """Render one page of changelogs as a rich table"""
+    from rich.table import Table
     
-    console.print("[blue]Fetching published changelogs...[/blue]")
-    changelogs = make_api_request("changelog")
-    
-    if not changelogs:
-        console.print("[yellow]No published changelogs found[/yellow]")
-        return
+    rows = [
+        (
+            changelog['version'],
+            changelog['title'][:50] + "..." if len(changelog['title']) > 50 else changelog['title'],
+            changelog['published_at'][:10] if changelog['published_at'] else 'N/A'
+        )
+        for changelog in changelogs
+    ]
     
     table = Table(title="Published Changelogs")
     table.add_column("Version", style="cyan")
     table.add_column("Title", style="green")
     table.add_column("Published", style="yellow")
-    
-    for changelog in changelogs:
-        published_date = changelog['published_at'][:10] if changelog['published_at'] else 'N/A'
-        table.add_row(
-            changelog['version'],
-            changelog['title'][:50] + "..." if len(changelog['title']) > 50 else changelog['title'],
-            published_date
-        )
+    for row in rows:
+        table.add_row(*row)
     
     console.print(table)
 
 @cli.command()
 @click.argument("version")
-def show(version: str):
+@click.pass_context
+def show(ctx, version: str):
     """Show a specific published changelog"""
-    
-    console.print(f"[blue]Fetching changelog for version {version}...[/blue]")
+    out(f"[blue]Fetching changelog for version {version}...[/blue]")
     
     try:
-        changelog = make_api_request(f"changelog/{version}")
+        changelog = make_api_request(f"changelog/{version}", config=ctx.obj['config'])
     except SystemExit:
-        console.print(f"[red]Changelog for version {version} not found[/red]")
+        out(f"[red]Changelog for version {version} not found[/red]")
+        if ctx.obj['fmt'] == "json":
+            # Scripts only have the exit status to go on
+            sys.exit(1)
+        return
+    
+    if ctx.obj['fmt'] == "json":
+        emit_json(changelog)
         return
     
+    from rich.markdown import Markdown
+    from rich.panel import Panel
+    
     console.print(Panel(
         Markdown(changelog['content']),
         title=f"{changelog['title']} (v{changelog['version']})",
@@ -359,13 +689,15 @@ def show(version: str):
     ))
 
 @cli.command()
-def config():
+@click.pass_context
+def config(ctx):
     """Configure the changelog generator"""
+    from rich.prompt import Prompt, Confirm
     
-    current_config = load_config()
+    current_config = ctx.obj['config']
     
-    console.print("[bold]Current Configuration:[/bold]")
-    console.print(json.dumps(current_config, indent=2))
+    out("[bold]Current Configuration:[/bold]")
+    console.print(json.dumps(dict(current_config), indent=2, default=dict))
     console.print()
     
     if not Confirm.ask("Would you like to modify the configuration?"):
@@ -401,16 +733,17 @@ def config():
 @cli.command()
 def init():
     """Initialize changelog generator in current directory"""
+    from rich.prompt import Prompt, Confirm
     
-    console.print("[bold]Initializing Changelog Generator[/bold]")
+    out("[bold]Initializing Changelog Generator[/bold]")
     
     # Check if we're in a git repository
     if not os.path.exists('.git'):
-        console.print("[red]Error: Not a Git repository. Please run 'git init' first.[/red]")
+        out("[red]Error: Not a Git repository. Please run 'git init' first.[/red]")
         sys.exit(1)
     
     # Create configuration file
-    config = DEFAULT_CONFIG.copy()
+    config = dict(DEFAULT_CONFIG, exclude_patterns=[*DEFAULT_CONFIG["exclude_patterns"]])
     
     # Ask for public URL
     public_url = Prompt.ask(
@@ -422,11 +755,11 @@ def init():
     
     # Ask for custom exclude patterns
     if Confirm.ask("Would you like to customize commit exclude patterns?"):
-        console.print("\nCurrent exclude patterns:")
+        out("\nCurrent exclude patterns:")
         for i, pattern in enumerate(config["exclude_patterns"]):
-            console.print(f"  {i+1}. {pattern}")
+            out(f"  {i+1}. {pattern}")
         
-        console.print("\nAdd additional patterns (one per line, empty line to finish):")
+        out("\nAdd additional patterns (one per line, empty line to finish):")
         while True:
             pattern = Prompt.ask("Pattern (regex)", default="")
             if not pattern:
@@ -435,38 +768,46 @@ def init():
     
     save_config(config)
     
-    console.print("[green]✅ Changelog generator initialized![/green]")
-    console.print("\nNext steps:")
-    console.print("1. Start the backend server: uvicorn main:app --reload")
-    console.print("2. Generate your first changelog: changelog-gen generate")
-    console.print("3. Publish it: changelog-gen publish --version v1.0.0")
+    out("[green]✅ Changelog generator initialized![/green]")
+    out("\nNext steps:")
+    out("1. Start the backend server: uvicorn main:app --reload")
+    out("2. Generate your first changelog: changelog-gen generate")
+    out("3. Publish it: changelog-gen publish --version v1.0.0")
 
 @cli.command()
-def server():
+@click.pass_context
+def server(ctx):
     """Check server status and connection"""
     
-    config = load_config()
+    config = ctx.obj['config']
     
     try:
-        health = make_api_request("health")
+        health = make_api_request("health", config=config)
+        
+        if ctx.obj['fmt'] == "json":
+            emit_json(health)
+            return
         
-        console.print("[green]✅ Server is running![/green]")
-        console.print(f"[cyan]URL:[/cyan] {config['api_base_url']}")
-        console.print(f"[cyan]Status:[/cyan] {health['status']}")
-        console.print(f"[cyan]OpenAI Configured:[/cyan] {'Yes' if health['openai_configured'] else 'No'}")
-        console.print(f"[cyan]Timestamp:[/cyan] {health['timestamp']}")
+        out("[green]✅ Server is running![/green]")
+        out(f"[cyan]URL:[/cyan] {config['api_base_url']}")
+        out(f"[cyan]Status:[/cyan] {health['status']}")
+        out(f"[cyan]OpenAI Configured:[/cyan] {'Yes' if health['openai_configured'] else 'No'}")
+        out(f"[cyan]Timestamp:[/cyan] {health['timestamp']}")
         
         if not health['openai_configured']:
-            console.print("\n[yellow]⚠️  OpenAI API key not configured. AI features will be limited.[/yellow]")
-            console.print("Set the OPENAI_API_KEY environment variable to enable AI-powered changelog generation.")
+            out("\n[yellow]⚠️  OpenAI API key not configured. AI features will be limited.[/yellow]")
+            out("Set the OPENAI_API_KEY environment variable to enable AI-powered changelog generation.")
         
     except SystemExit:
-        console.print("[red]❌ Server is not running or not accessible[/red]")
-        console.print(f"Expected server at: {config['api_base_url']}")
-        console.print("\nTo start the server:")
-        console.print("1. cd to the backend directory")
-        console.print("2. pip install -r requirements.txt")
-        console.print("3. uvicorn main:app --reload --port 8000")
+        if ctx.obj['fmt'] == "json":
+            emit_json({"status": "unreachable", "api_base_url": config['api_base_url']})
+            return
+        out("[red]❌ Server is not running or not accessible[/red]")
+        out(f"Expected server at: {config['api_base_url']}")
+        out("\nTo start the server:")
+        out("1. cd to the backend directory")
+        out("2. pip install -r requirements.txt")
+        out("3. uvicorn main:app --reload --port 8000")
 
 if __name__ == "__main__":
     cli()
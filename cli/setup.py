@@ -12,6 +12,9 @@ setup(
         "requests>=2.31.0",
         "rich>=13.7.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.9.0"],
+    },
     entry_points={
         "console_scripts": [
             "changelog-gen=changelog_gen:cli",